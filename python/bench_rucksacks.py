@@ -0,0 +1,58 @@
+import os
+import random
+import string
+import sys
+import tempfile
+import timeit
+
+import exercice3
+import exercice3_2
+import rucksack_mask
+
+ITEMS = string.ascii_letters
+
+
+def generate(filename: str, groups: int, half: int = 16, seed: int = 0):
+    # disjoint filler pools per compartment so that each line has a single shared
+    # item and each group of three a single badge
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        for _ in range(groups):
+            badge, *shared = rng.sample(ITEMS, len(ITEMS))
+            shared, fillers = shared[:3], shared[3:]
+            for i, item in enumerate(shared):
+                comp_1 = rng.choices(fillers[16 * i : 16 * i + 8], k=half - 2)
+                comp_2 = rng.choices(fillers[16 * i + 8 : 16 * i + 16], k=half - 1)
+                comp_1 += [item, badge]
+                comp_2 += [item]
+                rng.shuffle(comp_1)
+                rng.shuffle(comp_2)
+                f.write("".join(comp_1 + comp_2) + "\n")
+
+
+def sets_based(filename: str) -> tuple[int, int]:
+    with open(filename) as f:
+        sacks = [line.strip() for line in f]
+    part1 = sum(exercice3.priority(common) for common in exercice3.commons(sacks))
+    badges = exercice3_2.badges(exercice3_2.rucksacks_by_3(sacks))
+    return part1, sum(exercice3_2.priority(badge) for badge in badges)
+
+
+def mask_based(filename: str) -> tuple[int, int]:
+    sacks = list(rucksack_mask.rucksacks(filename))
+    part1 = rucksack_mask.shared_priorities(sacks)
+    return part1, rucksack_mask.badge_priorities(sacks)
+
+
+def main(groups: int = 200_000, repeat: int = 3):
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "3_input")
+        generate(filename, groups)
+        assert sets_based(filename) == mask_based(filename)
+        for solver in (sets_based, mask_based):
+            best = min(timeit.repeat(lambda: solver(filename), number=1, repeat=repeat))
+            print(f"{solver.__name__}: {best:.3f}s for {3 * groups} rucksacks")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
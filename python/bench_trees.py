@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+import exercice8
+
+
+def generate(filename: str, size: int, seed: int = 0):
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        for _ in range(size):
+            f.write("".join(rng.choices("0123456789", k=size)) + "\n")
+
+
+def pure_python(filename: str) -> tuple[int, int]:
+    trees_map = exercice8.build_map(filename)
+    visibles = exercice8.number_of_visibles(trees_map)
+    return visibles, exercice8.best_scenic_score(trees_map)[1]
+
+
+def vectorized(filename: str) -> tuple[int, int]:
+    grid = exercice8.load_grid(filename)
+    visibles = int(exercice8.np_visible_mask(grid).sum())
+    return visibles, int(exercice8.np_scenic_score_grid(grid).max())
+
+
+def main(size: int = 1000, repeat: int = 3):
+    if exercice8.np is None:
+        sys.exit("numpy is not installed, nothing to compare")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "8_input")
+        generate(filename, size)
+        assert pure_python(filename) == vectorized(filename)
+        for solver in (pure_python, vectorized):
+            best = min(timeit.repeat(lambda: solver(filename), number=1, repeat=repeat))
+            print(f"{solver.__name__}: {best:.3f}s for a {size}x{size} grid")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,200 @@
+import dataclasses
+import enum
+from typing import Iterable, Iterator, Self
+
+Stack = bytearray
+
+
+class Crane(enum.Enum):
+    # the CrateMover 9000 moves crates one at a time, so they land reversed
+    CRATE_MOVER_9000 = 9000
+    CRATE_MOVER_9001 = 9001
+
+
+@dataclasses.dataclass
+class Move:
+    move_count: int
+    from_stack: int
+    to_stack: int
+
+    @classmethod
+    def from_raw(cls, sentence: str) -> Self:
+        count, from_stack, to_stack = sentence.split()[1::2]
+        return cls(
+            move_count=int(count),
+            from_stack=int(from_stack) - 1,
+            to_stack=int(to_stack) - 1,
+        )
+
+
+class Stacks:
+    def __init__(self, stacks: list[Stack], crane: Crane = Crane.CRATE_MOVER_9001):
+        self.stacks = stacks
+        self.crane = crane
+
+    @classmethod
+    def from_raw(
+        cls, raw_stacks: list[str], crane: Crane = Crane.CRATE_MOVER_9001
+    ) -> Self:
+        iterable = iter(raw_stacks[::-1])
+        number_of_stacks = len(next(iterable).split())
+        stacks = [Stack() for _ in range(number_of_stacks)]
+        for line in iterable:
+            for i, item in enumerate(line[1::4]):
+                if item.strip():
+                    stacks[i].append(ord(item))
+        return cls(stacks, crane)
+
+    def handle(self, move: Move):
+        count = move.move_count
+        if not count or move.from_stack == move.to_stack:
+            # moved one at a time, crates put back on their stack end as they were
+            return
+        source = self.stacks[move.from_stack]
+        moved = source[-count:]
+        del source[-count:]
+        if self.crane is Crane.CRATE_MOVER_9000:
+            moved.reverse()
+        self.stacks[move.to_stack] += moved
+
+    @property
+    def tops(self) -> str:
+        return "".join(chr(stack[-1]) for stack in self.stacks if stack)
+
+
+@dataclasses.dataclass(frozen=True)
+class Segment:
+    # a view over shared, never copied crates, bottom to top unless reversed
+    crates: bytes
+    start: int
+    stop: int
+    reversed: bool = False
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def top(self) -> int:
+        return self.crates[self.start] if self.reversed else self.crates[self.stop - 1]
+
+    def split(self, count: int) -> tuple[Self, Self]:
+        # (bottom, top) where top holds the `count` upper crates
+        if self.reversed:
+            cut = self.start + count
+            return (
+                dataclasses.replace(self, start=cut),
+                dataclasses.replace(self, stop=cut),
+            )
+        cut = self.stop - count
+        return dataclasses.replace(self, stop=cut), dataclasses.replace(self, start=cut)
+
+    def flipped(self) -> Self:
+        return dataclasses.replace(self, reversed=not self.reversed)
+
+    def continues(self, other: Self) -> bool:
+        if self.crates is not other.crates or self.reversed != other.reversed:
+            return False
+        if self.reversed:
+            return other.stop == self.start
+        return other.start == self.stop
+
+    def merged(self, other: Self) -> Self:
+        if self.reversed:
+            return dataclasses.replace(self, start=other.start)
+        return dataclasses.replace(self, stop=other.stop)
+
+    def __bytes__(self) -> bytes:
+        crates = self.crates[self.start : self.stop]
+        return crates[::-1] if self.reversed else crates
+
+
+class RopeStack:
+    def __init__(self, segments: list[Segment] | None = None):
+        self.segments: list[Segment] = []
+        self.length = 0
+        self.put(segments or [])
+
+    @classmethod
+    def from_crates(cls, crates: bytes) -> Self:
+        return cls([Segment(crates, 0, len(crates))] if crates else [])
+
+    def take(self, count: int) -> list[Segment]:
+        # removes the `count` upper crates, returned as segments bottom to top
+        taken: list[Segment] = []
+        self.length -= count
+        while count:
+            segment = self.segments.pop()
+            if len(segment) > count:
+                segment, upper = segment.split(count)
+                self.segments.append(segment)
+                segment = upper
+            taken.append(segment)
+            count -= len(segment)
+        taken.reverse()
+        return taken
+
+    def put(self, segments: Iterable[Segment]):
+        for segment in segments:
+            self.length += len(segment)
+            if self.segments and self.segments[-1].continues(segment):
+                self.segments[-1] = self.segments[-1].merged(segment)
+            else:
+                self.segments.append(segment)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> int:
+        if index != -1:
+            raise IndexError("only the top crate of a rope stack can be read")
+        if not self.segments:
+            raise IndexError("empty stack")
+        return self.segments[-1].top
+
+    def __bytes__(self) -> bytes:
+        return b"".join(bytes(segment) for segment in self.segments)
+
+
+class RopeStacks(Stacks):
+    # moves relink segments of the initial crates and never copy a crate
+    @classmethod
+    def from_raw(
+        cls, raw_stacks: list[str], crane: Crane = Crane.CRATE_MOVER_9001
+    ) -> Self:
+        stacks = Stacks.from_raw(raw_stacks, crane).stacks
+        return cls([RopeStack.from_crates(bytes(stack)) for stack in stacks], crane)
+
+    def handle(self, move: Move):
+        if not move.move_count or move.from_stack == move.to_stack:
+            return
+        moved = self.stacks[move.from_stack].take(move.move_count)
+        if self.crane is Crane.CRATE_MOVER_9000:
+            moved = [segment.flipped() for segment in reversed(moved)]
+        self.stacks[move.to_stack].put(moved)
+
+
+def readstacks(filename="./inputs/5_input") -> tuple[list[str], Iterator[Move]]:
+    with open(filename) as f:
+        raw_stacks = []
+        for line in f:
+            if line.strip():
+                raw_stacks.append(line.strip("\n"))
+            else:
+                break
+        raw_moves = [line.strip() for line in f if line.strip()]
+    return raw_stacks, (Move.from_raw(raw_move) for raw_move in raw_moves)
+
+
+def rearrange(
+    crane: Crane, raw_stacks: list[str], moves: Iterable[Move], lazy: bool = False
+) -> Stacks:
+    stacks = (RopeStacks if lazy else Stacks).from_raw(raw_stacks, crane)
+    for move in moves:
+        stacks.handle(move)
+    return stacks
+
+
+if __name__ == "__main__":
+    for crane in Crane:
+        raw_stacks, moves = readstacks()
+        print(crane.name, rearrange(crane, raw_stacks, moves).tops)
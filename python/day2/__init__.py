@@ -0,0 +1,11 @@
+from .parser import INPUT, Round, round_counts, rounds
+from .play import Play, Strategy
+from .scoring import (
+    ScoreTable,
+    bulk_score,
+    part1,
+    part1_table,
+    part2,
+    part2_table,
+    table_score,
+)
@@ -0,0 +1,38 @@
+import mmap
+import os
+from collections import Counter
+from typing import Iterator
+
+INPUT = "./inputs/2_input"
+
+# a round as the byte values of its two letters, e.g. (ord("A"), ord("X"))
+Round = tuple[int, int]
+
+
+def rounds(filename: str = INPUT) -> Iterator[Round]:
+    with open(filename, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line[0], line[2]
+
+
+def is_fixed_width(data: bytes | mmap.mmap) -> bool:
+    # every round an "A X\n" line, the last newline being optional
+    if len(data) % 4 not in (0, 3):
+        return False
+    separators, newlines = data[1::4], data[3::4]
+    if separators.count(b" ") != len(separators):
+        return False
+    return newlines.count(b"\n") == len(newlines)
+
+
+def round_counts(filename: str = INPUT) -> Counter[Round]:
+    # fixed width files are counted from strided views, letters sitting at offsets
+    # 0 and 2 of every 4 bytes; anything else (CRLF, blank lines) goes line by line
+    with open(filename, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return Counter()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if is_fixed_width(data):
+                return Counter(zip(data[0::4], data[2::4]))
+    return Counter(rounds(filename))
@@ -1,6 +1,5 @@
 from enum import Enum
 from operator import gt, is_, lt
-from typing import Iterable
 
 
 class Strategy(Enum):
@@ -15,9 +14,9 @@ class Strategy(Enum):
 
 
 class Play(Enum):
-    ROCK = "A"
-    PAPER = "B"
-    SCISSORS = "C"
+    ROCK = 1
+    PAPER = 2
+    SCISSORS = 3
 
     def __gt__(self, other: "Play") -> bool:
         if self is Play.PAPER and other is Play.ROCK:
@@ -28,10 +27,17 @@ class Play(Enum):
             return True
         return False
 
+    @classmethod
+    def from_letter(cls, letter: str) -> "Play":
+        if letter in ("A", "X"):
+            return cls.ROCK
+        if letter in ("B", "Y"):
+            return cls.PAPER
+        return cls.SCISSORS
+
     @property
     def score(self) -> int:
-        scores = {Play.ROCK: 1, Play.PAPER: 2, Play.SCISSORS: 3}
-        return scores[self]
+        return self.value
 
     def score_against(self, other: "Play") -> int:
         win_score = 6 if self > other else 0
@@ -43,14 +49,3 @@ class Play(Enum):
             if strategy.operator(play, self):
                 return play
         raise ValueError(f"Invalid strategy {strategy}")
-
-
-def rounds(filename="./inputs/2_input") -> Iterable[tuple[Play, Play]]:
-    with open(filename) as f:
-        for line in f:
-            elf, strategy = line.strip().split()
-            elf_play = Play(elf)
-            yield elf_play, elf_play.from_strategy(Strategy(strategy))
-
-
-print(sum(me.score_against(elf) for elf, me in rounds()))
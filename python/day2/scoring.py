@@ -0,0 +1,44 @@
+from functools import cache
+from typing import Iterable
+
+from .parser import INPUT, Round, round_counts
+from .play import Play, Strategy
+
+ScoreTable = dict[Round, int]
+
+
+@cache
+def part1_table() -> ScoreTable:
+    return {
+        (ord(elf), ord(me)): Play.from_letter(me).score_against(Play.from_letter(elf))
+        for elf in "ABC"
+        for me in "XYZ"
+    }
+
+
+@cache
+def part2_table() -> ScoreTable:
+    table = {}
+    for elf in "ABC":
+        elf_play = Play.from_letter(elf)
+        for strategy in Strategy:
+            me = elf_play.from_strategy(strategy)
+            table[ord(elf), ord(strategy.value)] = me.score_against(elf_play)
+    return table
+
+
+def table_score(table: ScoreTable, rounds: Iterable[Round]) -> int:
+    return sum(table[round_] for round_ in rounds)
+
+
+def bulk_score(table: ScoreTable, filename: str = INPUT) -> int:
+    counts = round_counts(filename)
+    return sum(table[round_] * count for round_, count in counts.items())
+
+
+def part1(filename: str = INPUT) -> int:
+    return bulk_score(part1_table(), filename)
+
+
+def part2(filename: str = INPUT) -> int:
+    return bulk_score(part2_table(), filename)
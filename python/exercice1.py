@@ -1,9 +1,17 @@
-from typing import Iterable
+import heapq
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import BinaryIO, Iterable, Iterator
 
+CHUNK_SIZE = 1 << 20
 
-def elves_input() -> Iterable[list[int]]:
+
+def elves_input(filename: str = "./inputs/1_input") -> Iterable[list[int]]:
     elf_input: list[int] = []
-    with open("/home/vianney/perso/adventofcode2022/inputs/1_input") as file:
+    with open(filename) as file:
         for line in file:
             if not line.strip():
                 yield elf_input
@@ -13,6 +21,122 @@ def elves_input() -> Iterable[list[int]]:
         yield elf_input
 
 
-top_three = sorted(sum(elf_input) for elf_input in elves_input())[-3:]
-print(top_three)
-print(sum(top_three))
+ByteRange = tuple[int, int]
+
+
+def chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def range_chunks(
+    file: BinaryIO, byte_range: ByteRange, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    start, end = byte_range
+    file.seek(start)
+    remaining = end - start
+    while remaining > 0 and (chunk := file.read(min(chunk_size, remaining))):
+        remaining -= len(chunk)
+        yield chunk
+
+
+def elves_totals(raw_chunks: Iterable[bytes]) -> Iterator[int]:
+    total = 0
+    has_items = False
+    pending = b""
+    for chunk in raw_chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                total += int(line)
+                has_items = True
+            else:
+                yield total
+                total, has_items = 0, False
+    if pending.strip():
+        total += int(pending)
+        has_items = True
+    if has_items:
+        yield total
+
+
+def top_k(totals: Iterable[int], k: int = 3) -> list[int]:
+    heap: list[int] = []
+    for total in totals:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap)
+
+
+def top_calories(
+    filename: str = "./inputs/1_input", k: int = 3, chunk_size: int = CHUNK_SIZE
+) -> list[int]:
+    with open(filename, "rb") as file:
+        return top_k(elves_totals(chunks(file, chunk_size)), k)
+
+
+def next_group_start(file: BinaryIO, offset: int, chunk_size: int = CHUNK_SIZE) -> int:
+    # first offset after `offset` that starts a new elf, i.e. follows a blank line
+    file.seek(offset)
+    tail = b""
+    position = offset
+    for chunk in chunks(file, chunk_size):
+        window = tail + chunk
+        found = window.find(b"\n\n")
+        if found != -1:
+            return position - len(tail) + found + 2
+        tail = window[-1:]
+        position += len(chunk)
+    return position
+
+
+def split_ranges(filename: str, parts: int) -> list[ByteRange]:
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as file:
+        for part in range(1, parts):
+            offset = max(size * part // parts, boundaries[-1])
+            boundaries.append(next_group_start(file, offset))
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def top_calories_in_range(
+    filename: str, byte_range: ByteRange, k: int = 3, chunk_size: int = CHUNK_SIZE
+) -> list[int]:
+    with open(filename, "rb") as file:
+        return top_k(elves_totals(range_chunks(file, byte_range, chunk_size)), k)
+
+
+def parallel_top_calories(
+    filename: str = "./inputs/1_input",
+    k: int = 3,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[int]:
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(filename, workers)
+    reduce_range = partial(top_calories_in_range, filename, k=k, chunk_size=chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(reduce_range, ranges)
+        return top_k(chain.from_iterable(partials), k)
+
+
+def check_parallel(filename: str = "./inputs/1_input", workers: int | None = None):
+    top_three = sorted(sum(elf_input) for elf_input in elves_input(filename))[-3:]
+    parallel_top_three = parallel_top_calories(filename, k=3, workers=workers)
+    if parallel_top_three != top_three:
+        raise AssertionError(f"{parallel_top_three} != {top_three}")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        check_parallel()
+    top_three = top_calories()
+    print(top_three)
+    print(sum(top_three))
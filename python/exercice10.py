@@ -1,6 +1,10 @@
 import dataclasses
+import sys
+from array import array
+from bisect import bisect_right
 from collections.abc import Iterable, Iterator
-from typing import Protocol
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Protocol
 
 
 @dataclasses.dataclass
@@ -14,29 +18,72 @@ class Command(Protocol):
 
 
 SignalStrength = int
+LIT, DARK = ord("#"), ord(".")
+
+
+class Framebuffer:
+    # pixels of the current frame, completed frames are kept or written at once
+    def __init__(
+        self, width: int = 40, height: int = 6, output: BinaryIO | None = None
+    ):
+        self.width = width
+        self.frame_size = width * height
+        self.output = output
+        self.reset()
+
+    def reset(self):
+        self.pixels = bytearray(b"." * self.frame_size)
+        self.frames: list[bytes] = []
+        self.pending = 0
+
+    def draw(self, cycle: int, sprite: int):
+        position = (cycle - 1) % self.frame_size
+        column = position % self.width
+        self.pixels[position] = LIT if sprite - 1 <= column <= sprite + 1 else DARK
+        self.pending = position + 1
+        if self.pending == self.frame_size:
+            self.flush(self.pending)
+
+    def finish(self):
+        # the last frame of a program is usually incomplete
+        if self.pending:
+            self.flush(self.pending)
+
+    def flush(self, length: int | None = None):
+        frame = bytes(self.pixels[:length])
+        if self.output is None:
+            self.frames.append(frame)
+        else:
+            self.output.write(self.render(frame))
+        self.pixels[:] = b"." * self.frame_size
+        self.pending = 0
+
+    def render(self, frame: bytes) -> bytes:
+        rows = (frame[i : i + self.width] for i in range(0, len(frame), self.width))
+        return b"".join(row + b"\n" for row in rows)
 
 
 class Machine:
-    def __init__(self):
+    def __init__(self, screen: Framebuffer | None = None):
+        self.screen = screen
+        self.reset()
+
+    def reset(self):
         self.registry = Registry(1)
         self.cycle: int = 0
+        if self.screen is not None:
+            self.screen.reset()
 
     def execute(self, command: Command) -> Iterator[SignalStrength]:
         for _ in command.execute(self.registry):
             self.cycle += 1
-            self.draw_pixel()
+            if self.screen is not None:
+                self.screen.draw(self.cycle, self.registry.value)
             yield self.signal_strength
 
-    @property
-    def sprite_position(self) -> tuple[int, int, int]:
-        pt = self.registry.value
-        return (pt, pt + 1, pt + 2)
-
-    def draw_pixel(self):
-        crt = self.cycle % 40
-        pixel = "#" if crt in self.sprite_position else "."
-        end = "" if crt else "\n"
-        print(pixel, end=end)
+    def finish(self):
+        if self.screen is not None:
+            self.screen.finish()
 
     @property
     def signal_strength(self) -> SignalStrength:
@@ -45,9 +92,6 @@ class Machine:
         return self.registry.value * self.cycle
 
 
-machine = Machine()
-
-
 @dataclasses.dataclass
 class Addx:
     value: int
@@ -66,10 +110,12 @@ class Noop:
         return "Noop"
 
 
-def commands() -> Iterable[Command]:
-    with open("./inputs/10_input") as lines:
+def commands(filename: str = "./inputs/10_input") -> Iterable[Command]:
+    with open(filename) as lines:
         for line in lines:
             line = line.strip()
+            if not line:
+                continue
             if line == "noop":
                 yield Noop()
             else:
@@ -77,13 +123,104 @@ def commands() -> Iterable[Command]:
                 yield Addx(int(value))
 
 
-def signal_strengths(commands: Iterable[Command]) -> Iterable[SignalStrength]:
+def signal_strengths(
+    commands: Iterable[Command], machine: Machine | None = None
+) -> Iterable[SignalStrength]:
+    # a given machine is reset first: every program starts at cycle 0 with X = 1
+    machine = machine or Machine()
+    machine.reset()
     for cmd in commands:
         yield from machine.execute(cmd)
-
-
-def part1(commands: Iterable[Command]) -> int:
-    return sum(signal_strengths(commands))
-
-
-print(part1(commands()))
+    machine.finish()
+
+
+def part1(commands: Iterable[Command], machine: Machine | None = None) -> int:
+    return sum(signal_strengths(commands, machine))
+
+
+class Timeline:
+    # X register as a step function: `values[i]` holds from cycle `cycles[i]` on
+    def __init__(self, commands: Iterable[Command]):
+        self.cycles = array("q", [1])
+        self.values = array("q", [1])
+        cycle, value = 0, 1
+        for command in commands:
+            match command:
+                case Addx(delta):
+                    cycle += 2
+                    value += delta
+                    self.cycles.append(cycle + 1)
+                    self.values.append(value)
+                case Noop():
+                    cycle += 1
+                case _:
+                    raise ValueError(f"Unknown command {command}")
+        self.length = cycle
+
+    def value_at(self, cycle: int) -> int:
+        return self.values[bisect_right(self.cycles, cycle) - 1]
+
+    def signal_strength(self, cycle: int) -> SignalStrength:
+        return cycle * self.value_at(cycle)
+
+    def signal_strengths(self, cycles: Iterable[int]) -> int:
+        return sum(self.signal_strength(cycle) for cycle in cycles)
+
+    def interesting_cycles(self) -> range:
+        return range(20, self.length + 1, 40)
+
+    def frames(self, width: int = 40, height: int = 6) -> list[bytes]:
+        # X is constant over a run of cycles, so only the (at most) three lit
+        # columns of each row crossed by the run are written
+        pixels = bytearray(b"." * self.length)
+        run_ends = self.cycles[1:] + array("q", [self.length + 1])
+        for start, end, sprite in zip(self.cycles, run_ends, self.values):
+            first, last = start - 1, min(end, self.length + 1) - 2
+            for row_start in range(first - first % width, last + 1, width):
+                for column in (sprite - 1, sprite, sprite + 1):
+                    position = row_start + column
+                    if 0 <= column < width and first <= position <= last:
+                        pixels[position] = LIT
+        frame_size = width * height
+        return [
+            bytes(pixels[i : i + frame_size]) for i in range(0, len(pixels), frame_size)
+        ]
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgramResult:
+    signal_strength: int
+    frames: list[bytes]
+
+
+def run(filename: str) -> ProgramResult:
+    timeline = Timeline(commands(filename))
+    return ProgramResult(
+        signal_strength=timeline.signal_strengths(timeline.interesting_cycles()),
+        frames=timeline.frames(),
+    )
+
+
+def run_many(
+    filenames: Iterable[str], workers: int | None = None, chunksize: int = 16
+) -> list[ProgramResult]:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, filenames, chunksize=chunksize))
+
+
+def check_timeline(filename: str = "./inputs/10_input"):
+    machine = Machine(Framebuffer())
+    expected = part1(commands(filename), machine)
+    timeline = Timeline(commands(filename))
+    found = timeline.signal_strengths(timeline.interesting_cycles())
+    if found != expected:
+        raise AssertionError(f"{found} != {expected}")
+    if timeline.frames() != machine.screen.frames:
+        raise AssertionError("timeline frames differ from the machine ones")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        check_timeline()
+    machine = Machine(Framebuffer(output=sys.stdout.buffer))
+    print(part1(commands(), machine))
@@ -37,4 +37,5 @@ def commons(rucksacks: Iterable[Rucksack]) -> Iterable[str]:
         yield Compartments.from_rucksack(sack).only_shared
 
 
-print(sum(priority(common) for common in commons(rucksacks())))
+if __name__ == "__main__":
+    print(sum(priority(common) for common in commons(rucksacks())))
@@ -32,4 +32,5 @@ def badges(packs: Iterable[PackOf3]) -> Iterable[str]:
         yield next(iter(candidates))
 
 
-print(sum(priority(badge) for badge in badges(rucksacks_by_3(rucksacks()))))
+if __name__ == "__main__":
+    print(sum(priority(badge) for badge in badges(rucksacks_by_3(rucksacks()))))
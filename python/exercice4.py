@@ -0,0 +1,95 @@
+import dataclasses
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Self
+
+# assignment i of a file is the i-th range: pairs are made of assignments 2p, 2p + 1
+AssignmentId = int
+SEPARATORS = bytes.maketrans(b"-,", b"  ")
+
+
+@dataclasses.dataclass
+class Assignments:
+    starts: array
+    ends: array
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> Self:
+        sections = array("q", map(int, raw.translate(SEPARATORS).split()))
+        return cls(starts=sections[0::2], ends=sections[1::2])
+
+    @classmethod
+    def from_file(cls, filename: str = "./inputs/4_input") -> Self:
+        with open(filename, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def pairs(self) -> Iterator[tuple[int, int, int, int]]:
+        starts, ends = self.starts, self.ends
+        return zip(starts[0::2], ends[0::2], starts[1::2], ends[1::2])
+
+    def count_containing(self) -> int:
+        return sum(
+            (a <= c and d <= b) or (c <= a and b <= d) for a, b, c, d in self.pairs()
+        )
+
+    def count_overlapping(self) -> int:
+        return sum(a <= d and c <= b for a, b, c, d in self.pairs())
+
+
+class IntervalIndex:
+    # assignments sorted by start, laid out as an implicit balanced tree (the root
+    # of [lo, hi) is its middle) where each node knows the largest end below it
+    def __init__(self, assignments: Assignments):
+        starts, ends = assignments.starts, assignments.ends
+        order = sorted(range(len(assignments)), key=starts.__getitem__)
+        self.ids = array("q", order)
+        self.starts = array("q", (starts[i] for i in order))
+        self.ends = array("q", (ends[i] for i in order))
+        self.sorted_ends = array("q", sorted(ends))
+        self.max_ends = array("q", self.ends)
+        self._fill_max_ends(0, len(order))
+
+    def _fill_max_ends(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self.max_ends[mid] = max(
+            self.ends[mid],
+            self._fill_max_ends(lo, mid),
+            self._fill_max_ends(mid + 1, hi),
+        )
+        return self.max_ends[mid]
+
+    def count_overlapping(self, first: int, last: int | None = None) -> int:
+        # every assignment but the ones ending before `first` or starting after `last`
+        last = first if last is None else last
+        starting_after = len(self.starts) - bisect_right(self.starts, last)
+        ending_before = bisect_left(self.sorted_ends, first)
+        return len(self.starts) - starting_after - ending_before
+
+    def overlapping(
+        self, first: int, last: int | None = None
+    ) -> Iterator[AssignmentId]:
+        last = first if last is None else last
+        nodes = [(0, len(self.starts))]
+        while nodes:
+            lo, hi = nodes.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_ends[mid] < first:
+                continue
+            nodes.append((lo, mid))
+            if self.starts[mid] <= last:
+                if self.ends[mid] >= first:
+                    yield self.ids[mid]
+                nodes.append((mid + 1, hi))
+
+
+if __name__ == "__main__":
+    assignments = Assignments.from_file()
+    print("Part 1:", assignments.count_containing())
+    print("Part 2:", assignments.count_overlapping())
@@ -1,8 +1,13 @@
+import asyncio
 import collections
+import io
+import sys
 from itertools import islice
+from typing import AsyncIterator, BinaryIO, Iterable, Iterator
 
-with open("./inputs/6_input") as file:
-    line = file.readline()
+PACKET_SIZE = 4
+MESSAGE_SIZE = 14
+CHUNK_SIZE = 1 << 16
 
 
 def window(it, n):
@@ -14,7 +19,98 @@ def window(it, n):
         yield tuple(window)
 
 
-for i, win in enumerate(window(iter(line), 14)):
-    if len(set(win)) == 14:
-        print(i + 14)
-        break
+class MarkerDecoder:
+    # fed chunk by chunk, it only keeps the last `size` characters between chunks;
+    # newlines are dropped wherever they are, offsets count the other characters
+    def __init__(self, size: int):
+        self.size = size
+        self.counts = [0] * 256
+        self.distinct = 0
+        self.offset = 0
+        self.tail = b""
+
+    def feed(self, chunk: bytes | memoryview) -> list[int]:
+        # offsets, from the start of the stream, right after every window of
+        # `size` distinct characters ending in this chunk
+        size, counts, distinct = self.size, self.counts, self.distinct
+        data = self.tail + bytes(chunk).translate(None, b"\n")
+        start = len(self.tail)
+        found = []
+        for i in range(start, len(data)):
+            if i >= size:
+                leaving = data[i - size]
+                counts[leaving] -= 1
+                if not counts[leaving]:
+                    distinct -= 1
+            char = data[i]
+            if not counts[char]:
+                distinct += 1
+            counts[char] += 1
+            if distinct == size:
+                found.append(self.offset + i - start + 1)
+        self.distinct = distinct
+        self.offset += len(data) - start
+        self.tail = data[-size:]
+        return found
+
+
+def markers(
+    signal: bytes | memoryview, size: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[int]:
+    decoder = MarkerDecoder(size)
+    view = memoryview(signal)
+    for start in range(0, len(view), chunk_size):
+        yield from decoder.feed(view[start : start + chunk_size])
+
+
+def file_markers(
+    file: BinaryIO, size: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[int]:
+    decoder = MarkerDecoder(size)
+    while chunk := file.read(chunk_size):
+        yield from decoder.feed(chunk)
+
+
+async def stream_markers(
+    reader: asyncio.StreamReader, size: int, chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[int]:
+    decoder = MarkerDecoder(size)
+    while chunk := await reader.read(chunk_size):
+        for offset in decoder.feed(chunk):
+            yield offset
+
+
+def reference_markers(signal: bytes, size: int) -> Iterator[int]:
+    for i, win in enumerate(window(iter(signal), size)):
+        if len(set(win)) == size:
+            yield i + size
+
+
+def check_markers(signal: bytes, size: int):
+    found, expected = list(markers(signal, size)), list(reference_markers(signal, size))
+    if found != expected:
+        raise AssertionError(f"{found} != {expected}")
+
+
+def check_chunk_sizes(signal: bytes, size: int, chunk_sizes: Iterable[int]):
+    expected = list(file_markers(io.BytesIO(signal), size, len(signal) or 1))
+    for chunk_size in chunk_sizes:
+        found = list(file_markers(io.BytesIO(signal), size, chunk_size))
+        if found != expected:
+            raise AssertionError(f"chunks of {chunk_size}: {found} != {expected}")
+
+
+def read_signal(filename: str = "./inputs/6_input") -> bytes:
+    with open(filename, "rb") as file:
+        return file.readline().strip()
+
+
+if __name__ == "__main__":
+    filename = "./inputs/6_input"
+    signal = read_signal(filename)
+    if "--check" in sys.argv[1:]:
+        check_markers(signal, MESSAGE_SIZE)
+        check_chunk_sizes(signal + b"\n", MESSAGE_SIZE, range(1, 2 * MESSAGE_SIZE))
+    print("Part 1:", next(markers(signal, PACKET_SIZE)))
+    with open(filename, "rb") as file:
+        print("Part 2:", next(file_markers(file, MESSAGE_SIZE)))
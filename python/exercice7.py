@@ -1,6 +1,11 @@
 import dataclasses
-from functools import cached_property, singledispatch
-from typing import Iterator, Optional
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import singledispatch
+from itertools import accumulate
+from typing import Iterable, Iterator, Optional, Self
 
 
 class Ls:
@@ -20,38 +25,157 @@ class UnknownDir(Exception):
     ...
 
 
-@dataclasses.dataclass
+class UnknownFile(Exception):
+    ...
+
+
+DirIndex = int
+
+
+class Tree:
+    # directories live in parallel arrays indexed by creation order, so a parent
+    # always comes before its subdirectories
+    def __init__(self, root_name: DirName = "/"):
+        self.parents = array("q")
+        self.first_children = array("q")
+        self.last_children = array("q")
+        self.next_siblings = array("q")
+        self.own_sizes = array("q")
+        self.name_offsets = array("q", [0])
+        self.names = bytearray()
+        self.children: dict[tuple[DirIndex, DirName], DirIndex] = {}
+        self.files: dict[tuple[DirIndex, str], int] = {}
+        self._sizes: array | None = None
+        self.version = 0
+        self.add(root_name, parent=-1)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, name: DirName, parent: DirIndex) -> DirIndex:
+        index = len(self.parents)
+        self.parents.append(parent)
+        self.first_children.append(-1)
+        self.last_children.append(-1)
+        self.next_siblings.append(-1)
+        self.own_sizes.append(0)
+        self.names += name.encode()
+        self.name_offsets.append(len(self.names))
+        if parent >= 0:
+            self.children[parent, name] = index
+            if self.last_children[parent] >= 0:
+                self.next_siblings[self.last_children[parent]] = index
+            else:
+                self.first_children[parent] = index
+            self.last_children[parent] = index
+        if self._sizes is not None:
+            self._sizes.append(0)
+        self.version += 1
+        return index
+
+    def add_file(self, index: DirIndex, file_: File):
+        previous = self.files.get((index, file_.name), 0)
+        self.files[index, file_.name] = file_.size
+        self._resize(index, file_.size - previous)
+
+    def remove_file(self, index: DirIndex, filename: str):
+        try:
+            size = self.files.pop((index, filename))
+        except KeyError:
+            raise UnknownFile(filename)
+        self._resize(index, -size)
+
+    def _resize(self, index: DirIndex, delta: int):
+        self.own_sizes[index] += delta
+        self.version += 1
+        if self._sizes is None:
+            return
+        # once computed, totals are kept up to date along the parent chain
+        while index >= 0:
+            self._sizes[index] += delta
+            index = self.parents[index]
+
+    def name(self, index: DirIndex) -> DirName:
+        start, end = self.name_offsets[index], self.name_offsets[index + 1]
+        return self.names[start:end].decode()
+
+    def child(self, index: DirIndex, name: DirName) -> DirIndex | None:
+        return self.children.get((index, name))
+
+    def subdirs(self, index: DirIndex) -> Iterator[DirIndex]:
+        child = self.first_children[index]
+        while child >= 0:
+            yield child
+            child = self.next_siblings[child]
+
+    def descendants(self, index: DirIndex) -> Iterator[DirIndex]:
+        to_visit = [index]
+        while to_visit:
+            current = to_visit.pop()
+            yield current
+            to_visit.extend(reversed(list(self.subdirs(current))))
+
+    @property
+    def sizes(self) -> array:
+        if self._sizes is None:
+            # reversed creation order visits every subdirectory before its parent
+            sizes = array("q", self.own_sizes)
+            parents = self.parents
+            for index in range(len(sizes) - 1, 0, -1):
+                sizes[parents[index]] += sizes[index]
+            self._sizes = sizes
+        return self._sizes
+
+
+@dataclasses.dataclass(frozen=True)
 class Dir:
-    name: DirName
-    parent: Optional["Dir"] = None
-    subdirs: list["Dir"] = dataclasses.field(default_factory=list)
-    files: list[File] = dataclasses.field(default_factory=list)
+    tree: Tree = dataclasses.field(repr=False)
+    index: DirIndex = 0
+
+    @property
+    def name(self) -> DirName:
+        return self.tree.name(self.index)
 
-    @cached_property
+    @property
+    def root(self) -> "Dir":
+        return Dir(self.tree)
+
+    @property
+    def parent(self) -> Optional["Dir"]:
+        parent = self.tree.parents[self.index]
+        return Dir(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def subdirs(self) -> list["Dir"]:
+        return [Dir(self.tree, index) for index in self.tree.subdirs(self.index)]
+
+    @property
     def size(self) -> int:
-        return sum(f.size for f in self.files) + sum(d.size for d in self.subdirs)
+        return self.tree.sizes[self.index]
 
     def up(self) -> "Dir":
-        return self.parent if self.parent else self
+        return self.parent or self
 
     def into(self, dirname: DirName) -> "Dir":
-        try:
-            return next(d for d in self.subdirs if d.name == dirname)
-        except StopIteration:
+        index = self.tree.child(self.index, dirname)
+        if index is None:
             raise UnknownDir(dirname)
+        return Dir(self.tree, index)
 
     def add_subdir(self, dirname: DirName) -> "Dir":
         try:
             return self.into(dirname)
         except UnknownDir:
-            subdir = self.__class__(dirname, parent=self)
-            self.subdirs.append(subdir)
-            return subdir
+            return Dir(self.tree, self.tree.add(dirname, self.index))
+
+    def add_file(self, file_: File):
+        self.tree.add_file(self.index, file_)
+
+    def remove_file(self, filename: str):
+        self.tree.remove_file(self.index, filename)
 
     def __iter__(self) -> Iterator["Dir"]:
-        yield self
-        for subdir in self.subdirs:
-            yield from subdir
+        return (Dir(self.tree, index) for index in self.tree.descendants(self.index))
 
     def __gt__(self, other: "Dir") -> bool:
         return self.size < other.size
@@ -78,24 +202,22 @@ class Cd:
         return current_dir.into(self.dirname)
 
 
-def listing() -> Iterator[Cd | Ls | File | DirName]:
-    with open("./inputs/7_input") as f:
-        cd_prefix, ls_prefix = "$ cd ", "$ ls"
-        for line in f:
-            line = line.strip()
-            if line.startswith(cd_prefix):
-                yield Cd(line.removeprefix(cd_prefix))
-            elif line.startswith(ls_prefix):
-                yield Ls()
+def listing(lines: Iterable[str]) -> Iterator[Cd | Ls | File | DirName]:
+    cd_prefix, ls_prefix = "$ cd ", "$ ls"
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(cd_prefix):
+            yield Cd(line.removeprefix(cd_prefix))
+        elif line.startswith(ls_prefix):
+            yield Ls()
+        else:
+            filetype_or_size, filename = line.split(maxsplit=1)
+            if filetype_or_size == "dir":
+                yield DirName(filename)
             else:
-                filetype_or_size, filename = line.split(maxsplit=1)
-                if filetype_or_size == "dir":
-                    yield DirName(filename)
-                else:
-                    yield File(filename, int(filetype_or_size))
-
-
-ROOT_DIR = Dir("/")
+                yield File(filename, int(filetype_or_size))
 
 
 @singledispatch
@@ -107,7 +229,7 @@ def handle(invalid, current_dir: Dir) -> Dir:
 def _(cd: Cd, current_dir: Dir) -> Dir:
     match cd:
         case Cd(DirName("/")):
-            return ROOT_DIR
+            return current_dir.root
         case _:
             return cd.execute(current_dir)
 
@@ -119,7 +241,7 @@ def _(_: Ls, current_dir: Dir) -> Dir:
 
 @handle.register
 def _(file_: File, current_dir: Dir) -> Dir:
-    current_dir.files.append(file_)
+    current_dir.add_file(file_)
     return current_dir
 
 
@@ -129,29 +251,105 @@ def _(dirname: DirName, current_dir: Dir) -> Dir:
     return current_dir
 
 
-def build_filesystem():
-    current_dir = ROOT_DIR
+class SizeIndex:
+    # a snapshot of every directory size, sorted, with running totals
+    def __init__(self, tree: Tree):
+        sizes = tree.sizes
+        self.tree = tree
+        self.version = tree.version
+        self.indexes = array("q", sorted(range(len(sizes)), key=sizes.__getitem__))
+        self.sizes = array("q", (sizes[index] for index in self.indexes))
+        self.prefix_sums = array("q", accumulate(self.sizes, initial=0))
+
+    def sum_at_most(self, threshold: int) -> int:
+        return self.prefix_sums[bisect_right(self.sizes, threshold)]
+
+    def smallest_at_least(self, minimum: int) -> Dir | None:
+        position = bisect_left(self.sizes, minimum)
+        if position == len(self.sizes):
+            return None
+        return Dir(self.tree, self.indexes[position])
+
+
+TOTAL_SPACE = 70_000_000
+NEEDED_SPACE = 30_000_000
+
+
+@dataclasses.dataclass(frozen=True)
+class Summary:
+    small_dirs_size: int
+    freed_dir_size: int
+
+
+class FileSystem:
+    def __init__(self):
+        self.root = Dir(Tree("/"))
+        self.current_dir = self.root
+        self._size_index: SizeIndex | None = None
+
+    @classmethod
+    def from_transcript(cls, transcript: str | os.PathLike | Iterable[str]) -> Self:
+        filesystem = cls()
+        if isinstance(transcript, (str, os.PathLike)):
+            with open(transcript) as lines:
+                filesystem.replay(lines)
+        else:
+            filesystem.replay(transcript)
+        return filesystem
+
+    def replay(self, lines: Iterable[str]):
+        for entry in listing(lines):
+            self.current_dir = handle(entry, self.current_dir)
+
+    def small_sizes(self, max_size: int = 100_000) -> Iterator[Dir]:
+        return (dir_ for dir_ in self.root if dir_.size <= max_size)
+
+    def eligible_dir_freeing(self, missing_space: int) -> Iterator[Dir]:
+        return (dir_ for dir_ in self.root if dir_.size >= missing_space)
+
+    @property
+    def missing_space(self) -> int:
+        available_space = TOTAL_SPACE - self.root.size
+        return NEEDED_SPACE - available_space
+
+    @property
+    def size_index(self) -> SizeIndex:
+        # rebuilt on the first query following a change of the tree
+        if (
+            self._size_index is None
+            or self._size_index.version != self.root.tree.version
+        ):
+            self._size_index = SizeIndex(self.root.tree)
+        return self._size_index
+
+    def small_dirs_size(self, max_size: int = 100_000) -> int:
+        return self.size_index.sum_at_most(max_size)
+
+    def dir_to_free(self) -> Dir:
+        dir_ = self.size_index.smallest_at_least(self.missing_space)
+        if dir_ is None:
+            raise UnknownDir(f"no directory frees {self.missing_space}")
+        return dir_
 
-    for entry in listing():
-        current_dir = handle(entry, current_dir)
+    def summary(self) -> Summary:
+        return Summary(
+            small_dirs_size=self.small_dirs_size(),
+            freed_dir_size=self.dir_to_free().size,
+        )
 
 
-def small_sizes(max_size: int = 100_000) -> Iterator[Dir]:
-    return (dir_ for dir_ in ROOT_DIR if dir_.size <= max_size)
+def summarize(transcript: str) -> Summary:
+    return FileSystem.from_transcript(transcript).summary()
 
 
-def eligible_dir_freeing(missing_space: int) -> Iterator[Dir]:
-    return (dir_ for dir_ in ROOT_DIR if dir_.size >= missing_space)
+def summarize_many(
+    transcripts: Iterable[str], workers: int | None = None, chunksize: int = 16
+) -> list[Summary]:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize, transcripts, chunksize=chunksize))
 
 
 if __name__ == "__main__":
-    build_filesystem()
-    print("Part 1, total sum of small dirs:", sum(dir_.size for dir_ in small_sizes()))
-
-    needed_space = 30_000_000
-    total_space = 70_000_000
-    used_space = ROOT_DIR.size
-    available_space = total_space - used_space
-    missing_space = needed_space - available_space
-    eligible = sorted(eligible_dir_freeing(missing_space), reverse=True)
-    print("Part 2, Candidate for suppression:", eligible[0])
+    filesystem = FileSystem.from_transcript("./inputs/7_input")
+    print("Part 1, total sum of small dirs:", filesystem.small_dirs_size())
+    print("Part 2, Candidate for suppression:", filesystem.dir_to_free())
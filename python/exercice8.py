@@ -1,12 +1,19 @@
-from typing import Iterator
+from typing import Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 TreeMap = list[list[int]]
 Position = tuple[int, int]
+VisibilityMask = list[list[bool]]
+ScoreGrid = list[list[int]]
 
 
-def build_map() -> list[list[int]]:
+def build_map(filename: str = "./inputs/8_input") -> list[list[int]]:
     tree_map = []
-    with open("./inputs/8_input") as f:
+    with open(filename) as f:
         for line in f:
             trees_line = [int(i) for i in line.strip()]
             tree_map.append(trees_line)
@@ -29,6 +36,32 @@ def get_visibles(trees_map: TreeMap) -> Iterator[Position]:
                 yield (y, x)
 
 
+def _sweep(heights: Sequence[int], indexes: range) -> Iterator[int]:
+    # indexes of the trees taller than every tree before them along the sweep
+    tallest = -1
+    for i in indexes:
+        if heights[i] > tallest:
+            tallest = heights[i]
+            yield i
+            if tallest == 9:
+                break
+
+
+def visible_mask(trees_map: TreeMap) -> VisibilityMask:
+    mask = [[False] * len(line) for line in trees_map]
+    for y, line in enumerate(trees_map):
+        width = len(line)
+        for indexes in (range(width), range(width - 1, -1, -1)):
+            for x in _sweep(line, indexes):
+                mask[y][x] = True
+    for x, column in enumerate(zip(*trees_map)):
+        height = len(column)
+        for indexes in (range(height), range(height - 1, -1, -1)):
+            for y in _sweep(column, indexes):
+                mask[y][x] = True
+    return mask
+
+
 def count_visible(height, others: list[int]) -> int:
     count = 0
     for other in others:
@@ -39,7 +72,7 @@ def count_visible(height, others: list[int]) -> int:
 
 
 def number_of_visibles(trees_map: TreeMap) -> int:
-    return sum(1 for _ in get_visibles(trees_map))
+    return sum(map(sum, visible_mask(trees_map)))
 
 
 def scenic_scores(trees_map: TreeMap) -> Iterator[int]:
@@ -55,7 +88,111 @@ def scenic_scores(trees_map: TreeMap) -> Iterator[int]:
             )
 
 
+def _viewing_distances(heights: Sequence[int], indexes: range) -> list[int]:
+    # for each tree along the sweep, the distance back to the first tree as tall;
+    # `blockers` keeps the steps of the trees still able to block, tallest first
+    distances = []
+    blockers: list[int] = []
+    for step, i in enumerate(indexes):
+        height = heights[i]
+        while blockers and heights[indexes[blockers[-1]]] < height:
+            blockers.pop()
+        distances.append(step - blockers[-1] if blockers else step)
+        blockers.append(step)
+    return distances
+
+
+def scenic_score_grid(trees_map: TreeMap) -> ScoreGrid:
+    scores = [[1] * len(line) for line in trees_map]
+    for y, line in enumerate(trees_map):
+        width = len(line)
+        for indexes in (range(width), range(width - 1, -1, -1)):
+            for x, distance in zip(indexes, _viewing_distances(line, indexes)):
+                scores[y][x] *= distance
+    for x, column in enumerate(zip(*trees_map)):
+        height = len(column)
+        for indexes in (range(height), range(height - 1, -1, -1)):
+            for y, distance in zip(indexes, _viewing_distances(column, indexes)):
+                scores[y][x] *= distance
+    return scores
+
+
+def best_scenic_score(trees_map: TreeMap) -> tuple[Position, int]:
+    return max(
+        (
+            ((y, x), score)
+            for y, line in enumerate(scenic_score_grid(trees_map))
+            for x, score in enumerate(line)
+        ),
+        key=lambda position_score: position_score[1],
+    )
+
+
+def _require_numpy(name: str):
+    if np is None:
+        raise ImportError(f"numpy is required for {name}")
+
+
+def load_grid(filename: str = "./inputs/8_input") -> "np.ndarray":
+    _require_numpy("load_grid")
+    with open(filename, "rb") as f:
+        raw = f.read()
+    width = len(raw.split(b"\n", 1)[0].rstrip(b"\r"))
+    digits = raw.translate(None, b"\r\n")
+    return (np.frombuffer(digits, dtype=np.uint8) - ord("0")).reshape(-1, width)
+
+
+def _shifted(values: "np.ndarray", axis: int, fill: int) -> "np.ndarray":
+    # values of the previous tree along the sweep, `fill` for the first one
+    shifted = np.roll(values, 1, axis=axis)
+    first = [slice(None)] * values.ndim
+    first[axis] = 0
+    shifted[tuple(first)] = fill
+    return shifted
+
+
+def np_visible_mask(grid: "np.ndarray") -> "np.ndarray":
+    _require_numpy("np_visible_mask")
+    heights = grid.astype(np.int8)
+    mask = np.zeros(grid.shape, dtype=bool)
+    for axis in (0, 1):
+        for flip in (False, True):
+            view = np.flip(heights, axis) if flip else heights
+            tallest = np.maximum.accumulate(view, axis=axis)
+            visible = view > _shifted(tallest, axis, -1)
+            mask |= np.flip(visible, axis) if flip else visible
+    return mask
+
+
+def np_scenic_score_grid(grid: "np.ndarray") -> "np.ndarray":
+    _require_numpy("np_scenic_score_grid")
+    scores = np.ones(grid.shape, dtype=np.int64)
+    for axis in (0, 1):
+        for flip in (False, True):
+            view = np.flip(grid, axis) if flip else grid
+            shape = [1, 1]
+            shape[axis] = grid.shape[axis]
+            steps = np.arange(grid.shape[axis], dtype=np.int32).reshape(shape)
+            distances = np.zeros(grid.shape, dtype=np.int32)
+            for height in range(10):
+                # last step, before each tree, holding a tree at least `height` tall
+                blockers = np.where(view >= height, steps, 0)
+                last = _shifted(np.maximum.accumulate(blockers, axis=axis), axis, 0)
+                np.copyto(distances, steps - last, where=view == height)
+            scores *= np.flip(distances, axis) if flip else distances
+    return scores
+
+
+def solve(filename: str = "./inputs/8_input") -> tuple[int, int]:
+    # (number of visible trees, best scenic score), vectorized when numpy is here
+    if np is None:
+        trees_map = build_map(filename)
+        return number_of_visibles(trees_map), best_scenic_score(trees_map)[1]
+    grid = load_grid(filename)
+    return int(np_visible_mask(grid).sum()), int(np_scenic_score_grid(grid).max())
+
+
 if __name__ == "__main__":
-    trees_map = build_map()
-    print("Part1, number_of_visibles =", number_of_visibles(trees_map))
-    print("Part2, best scenic score =", max(scenic_scores(trees_map)))
+    visibles, best_score = solve()
+    print("Part1, number_of_visibles =", visibles)
+    print("Part2, best scenic score =", best_score)
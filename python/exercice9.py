@@ -1,6 +1,9 @@
 import dataclasses
 import enum
-from typing import Iterable, Iterator, Optional, Self
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import partial
+from typing import Callable, Iterable, Iterator, Optional, Self
 
 
 class Direction(enum.Enum):
@@ -181,5 +184,221 @@ def part_2(moves: Iterable[Move]) -> int:
     return len(snake_tracker.tail_positions)
 
 
-print("part 1:", part_1(moves()))
-print("part 2:", part_2(moves()))
+# the flat engine: knots are two int lists, a move is (dx, dy, steps)
+Step = tuple[int, int, int]
+UNIT_VECTORS = {"U": (0, 1), "D": (0, -1), "R": (1, 0), "L": (-1, 0)}
+# cells are packed in a single int, each coordinate shifted to stay positive
+OFFSET = 1 << 31
+
+
+def pack(x: int, y: int) -> int:
+    return (x + OFFSET) << 32 | (y + OFFSET)
+
+
+def read_steps(filename: str = "inputs/9_input") -> list[Step]:
+    with open(filename) as f:
+        steps = []
+        for line in f:
+            if line.strip():
+                direction, count = line.split()
+                steps.append((*UNIT_VECTORS[direction], int(count)))
+        return steps
+
+
+def unpack(cell: int) -> tuple[int, int]:
+    return (cell >> 32) - OFFSET, (cell & 0xFFFF_FFFF) - OFFSET
+
+
+Interval = tuple[int, int]
+
+
+def _merged(intervals: list[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _covers(intervals: list[Interval], value: int) -> bool:
+    # `intervals` are merged, so only the last one starting before `value` counts
+    position = bisect_right(intervals, (value, float("inf"))) - 1
+    return position >= 0 and intervals[position][1] >= value
+
+
+class Trail:
+    # cells visited by a knot: single cells, and straight runs kept as intervals
+    # per row or per column instead of cell by cell
+    def __init__(self):
+        self.cells = {pack(0, 0)}
+        self.rows: dict[int, list[Interval]] = defaultdict(list)
+        self.columns: dict[int, list[Interval]] = defaultdict(list)
+
+    def add(self, x: int, y: int):
+        self.cells.add(pack(x, y))
+
+    def add_run(self, x: int, y: int, dx: int, dy: int, count: int):
+        # cells (x + k * dx, y + k * dy) for k in 1..count
+        if dy == 0:
+            start, end = sorted((x + dx, x + count * dx))
+            self.rows[y].append((start, end))
+        else:
+            start, end = sorted((y + dy, y + count * dy))
+            self.columns[x].append((start, end))
+
+    def __len__(self) -> int:
+        rows = {y: _merged(intervals) for y, intervals in self.rows.items()}
+        columns = {x: _merged(intervals) for x, intervals in self.columns.items()}
+        count = sum(end - start + 1 for runs in rows.values() for start, end in runs)
+        count += sum(
+            end - start + 1 for runs in columns.values() for start, end in runs
+        )
+        # cells both on a row run and on a column run were counted twice
+        sorted_rows = sorted(rows)
+        for x, runs in columns.items():
+            for start, end in runs:
+                first = bisect_left(sorted_rows, start)
+                for y in sorted_rows[first : bisect_right(sorted_rows, end)]:
+                    count -= _covers(rows[y], x)
+        for cell in self.cells:
+            x, y = unpack(cell)
+            if not (
+                (y in rows and _covers(rows[y], x))
+                or (x in columns and _covers(columns[x], y))
+            ):
+                count += 1
+        return count
+
+
+Bounds = tuple[int, int, int, int]
+# above this many cells for all tracked knots, trails fall back to intervals
+BITMAP_LIMIT = 1 << 26
+
+
+def head_bounds(steps: Iterable[Step]) -> Bounds:
+    # (xmin, xmax, ymin, ymax) of the head path: followers never leave that box
+    x = y = xmin = xmax = ymin = ymax = 0
+    for dx, dy, count in steps:
+        x += dx * count
+        y += dy * count
+        xmin, xmax = min(xmin, x), max(xmax, x)
+        ymin, ymax = min(ymin, y), max(ymax, y)
+    return xmin, xmax, ymin, ymax
+
+
+class BitmapTrail:
+    # one byte per cell of the bounding box, rows of `width` cells
+    def __init__(self, bounds: Bounds):
+        xmin, xmax, ymin, ymax = bounds
+        self.xmin, self.ymin = xmin, ymin
+        self.width = xmax - xmin + 1
+        self.bitmap = bytearray(self.width * (ymax - ymin + 1))
+        self.add(0, 0)
+
+    def _offset(self, x: int, y: int) -> int:
+        return (y - self.ymin) * self.width + x - self.xmin
+
+    def add(self, x: int, y: int):
+        self.bitmap[self._offset(x, y)] = 1
+
+    def add_run(self, x: int, y: int, dx: int, dy: int, count: int):
+        first = self._offset(x + dx, y + dy)
+        last = self._offset(x + count * dx, y + count * dy)
+        first, last = min(first, last), max(first, last)
+        stride = self.width if dy else 1
+        self.bitmap[first : last + 1 : stride] = b"\x01" * count
+
+    def __len__(self) -> int:
+        return len(self.bitmap) - self.bitmap.count(0)
+
+
+def trail_factory(bounds: Bounds, trails: int) -> Callable[[], Trail | BitmapTrail]:
+    xmin, xmax, ymin, ymax = bounds
+    if (xmax - xmin + 1) * (ymax - ymin + 1) * trails <= BITMAP_LIMIT:
+        return partial(BitmapTrail, bounds)
+    return Trail
+
+
+class Rope:
+    def __init__(
+        self,
+        knots: int,
+        tracked: Iterable[int] | None = None,
+        new_trail: Callable[[], Trail | BitmapTrail] = Trail,
+    ):
+        # `tracked` knots record the cells they visit, only the tail by default
+        self.xs = [0] * knots
+        self.ys = [0] * knots
+        tracked = sorted(set(tracked if tracked is not None else [knots - 1]))
+        if tracked and not 0 <= tracked[0] <= tracked[-1] < knots:
+            raise ValueError(f"tracked knots {tracked} outside a {knots} knots rope")
+        self.trails = {knot: new_trail() for knot in tracked}
+
+    @property
+    def tail_trail(self) -> Trail | BitmapTrail:
+        return self.trails[len(self.xs) - 1]
+
+    def is_straight(self, dx: int, dy: int) -> bool:
+        # every knot one step behind the previous one, along (dx, dy)
+        xs, ys = self.xs, self.ys
+        last = len(xs) - 1
+        if xs[0] - xs[last] != last * dx or ys[0] - ys[last] != last * dy:
+            return False
+        return all(
+            xs[i - 1] - xs[i] == dx and ys[i - 1] - ys[i] == dy
+            for i in range(1, last + 1)
+        )
+
+    def move(self, dx: int, dy: int, steps: int):
+        xs, ys = self.xs, self.ys
+        last = len(xs) - 1
+        tracked = list(self.trails.items())
+        for step in range(steps):
+            if self.is_straight(dx, dy):
+                # a straight rope moves in lockstep until the end of the move
+                remaining = steps - step
+                for knot, trail in tracked:
+                    trail.add_run(xs[knot], ys[knot], dx, dy, remaining)
+                for i in range(last + 1):
+                    xs[i] += remaining * dx
+                    ys[i] += remaining * dy
+                return
+            xs[0] += dx
+            ys[0] += dy
+            moved = last
+            for i in range(1, last + 1):
+                gap_x = xs[i - 1] - xs[i]
+                gap_y = ys[i - 1] - ys[i]
+                if -1 <= gap_x <= 1 and -1 <= gap_y <= 1:
+                    # this knot stays, so does every knot behind it
+                    moved = i - 1
+                    break
+                xs[i] += (gap_x > 0) - (gap_x < 0)
+                ys[i] += (gap_y > 0) - (gap_y < 0)
+            for knot, trail in tracked:
+                if knot > moved:
+                    break
+                trail.add(xs[knot], ys[knot])
+
+
+def visited_counts(
+    steps: Iterable[Step], knots: int = 10, tracked: Iterable[int] | None = None
+) -> dict[int, int]:
+    # knot k of a long rope follows the same path as the tail of a rope of k + 1
+    # knots, so a single simulation answers for every tracked knot
+    steps = list(steps)
+    # by default the knot right behind the head and the tail
+    tracked = set(tracked if tracked is not None else {min(1, knots - 1), knots - 1})
+    new_trail = trail_factory(head_bounds(steps), len(tracked))
+    rope = Rope(knots, tracked, new_trail)
+    for dx, dy, count in steps:
+        rope.move(dx, dy, count)
+    return {knot: len(trail) for knot, trail in rope.trails.items()}
+
+
+if __name__ == "__main__":
+    counts = visited_counts(read_steps(), knots=10, tracked=(1, 9))
+    print("part 1:", counts[1])
+    print("part 2:", counts[9])